@@ -1,5 +1,8 @@
 from datetime import datetime
 from abc import ABC, abstractmethod
+from dataclasses import dataclass, field, fields, InitVar, KW_ONLY, MISSING
+from functools import lru_cache
+from types import MappingProxyType
 from warnings import warn
 
 FORECAST_CROSSREF = {
@@ -42,6 +45,14 @@ DEFAULT_SEPARATORS = {
         "SUBELEMENT":":"
     }
 }
+_ESCAPED_SEPARATORS = {
+    language: {key: value.encode().decode('unicode_escape') for key, value in separators.items()}
+    for language, separators in DEFAULT_SEPARATORS.items()
+}
+
+@lru_cache(maxsize=None)
+def _unescape_separator(separator: str) -> str:
+    return separator.encode().decode('unicode_escape')
 
 # These dictionaries are formatted using tuples since they work natively with str.startswith() methods and multiple options to match.
 EDI_SEGMENTS = {
@@ -86,53 +97,107 @@ EDI_SEGMENTS = {
         "FILE_END":("UNT",)
     }
 }
+# Attribute names which don't follow the "<key>_segment" pattern.
+_SEGMENT_ATTR_NAMES = {
+    "QUANTITY":"qty_details_segment",
+}
+# Segment attributes per language, built once and copied onto each instance with a single dict update.
+_SEGMENT_ATTRS = {
+    language: {_SEGMENT_ATTR_NAMES.get(key, f"{key.lower()}_segment"): value for key, value in segments.items()}
+    for language, segments in EDI_SEGMENTS.items()
+}
+
+def _segment_tags(segments):
+    """Segment values are usually tuples of tags, but a single tag string is accepted too."""
+    return (segments,) if isinstance(segments, str) else segments
+
+def _freeze(value):
+    """Recursively convert dicts to read-only MappingProxyType views and lists to tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+# These are read-only lookup tables.
+FORECAST_CROSSREF = _freeze(FORECAST_CROSSREF)
+TIMING_CROSSREF = _freeze(TIMING_CROSSREF)
+HEADER_DATES = _freeze(HEADER_DATES)
+DEFAULT_SEPARATORS = _freeze(DEFAULT_SEPARATORS)
+EDI_SEGMENTS = _freeze(EDI_SEGMENTS)
+_ESCAPED_SEPARATORS = _freeze(_ESCAPED_SEPARATORS)
+_SEGMENT_ATTR_NAMES = _freeze(_SEGMENT_ATTR_NAMES)
+_SEGMENT_ATTRS = _freeze(_SEGMENT_ATTRS)
+
 
+@lru_cache(maxsize=None)
+def _repr_fields(cls):
+    """(name, default) pairs for a dataclass, with MISSING for required fields. Computed once per class."""
+    return tuple((f.name, f.default) for f in fields(cls))
 
+@dataclass(slots=True, eq=False, repr=False)
 class ElementExtractionFailure(object):
-    def __init__(self, failure_point: str, failure_reason: str, segment: str, position: int, element: str=None, subposition: int=None, date: bool=False, date_format_in: str='%Y%m%d', date_format_out: str='%m-%d-%Y'):
-        self.failure_point = failure_point
-        self.failure_reason = failure_reason
-        self.segment = segment
-        self.position = position
-        self.element = element
-        self.subposition = subposition
-        self.date = date
-        self.date_format_in = date_format_in
-        self.date_format_out = date_format_out
+    failure_point: str
+    failure_reason: str
+    segment: str
+    position: int
+    element: str = None
+    subposition: int = None
+    date: bool = False
+    date_format_in: str = '%Y%m%d'
+    date_format_out: str = '%m-%d-%Y'
     def __repr__(self):
-        fields = [
-            f"failure_point={self.failure_point!r}",
-            f"failure_reason={self.failure_reason!r}",
-            f"segment={self.segment!r}",
-            f"position={self.position!r}",
-        ]
-        if self.element is not None:
-            fields.append(f"element={self.element!r}")
-        if self.subposition is not None:
-            fields.append(f"subposition={self.subposition!r}")
-        if self.date:
-            fields.append(f"date_format_in={self.date_format_in!r}")
-            fields.append(f"date_format_out={self.date_format_out!r}")
-        return f"ElementExtractionFailure({', '.join(fields)})"
+        # Required fields are always shown; optional ones only when they differ from their default.
+        shown = []
+        for name, default in _repr_fields(type(self)):
+            value = getattr(self, name)
+            if default is MISSING or value != default:
+                shown.append(f"{name}={value!r}")
+        return f"{type(self).__name__}({', '.join(shown)})"
     def __str__(self):
         return self.segment
+def _single(extract_one, position):
+    return extract_one(position)
+
+def _many_list(extract_one, positions):
+    return [extract_one(p) for p in positions]
+
+def _many_dict(extract_one, positions):
+    result = {}
+    for key, spec in positions.items():
+        if isinstance(spec, dict):
+            # supports e.g. {"pos": 4, "date": True}
+            pos = spec.get("pos")
+            force_date = spec.get("date", None)
+        else:
+            pos = spec
+            force_date = None
+        result[key] = extract_one(pos, force_date=force_date)
+    return result
+
+# universal_element_extract dispatches on type(position) with a single dict lookup.
+_POS_HANDLERS = {
+    int: _single,
+    tuple: _single,
+    list: _many_list,
+    dict: _many_dict,
+}
+
 class EdiBase(ABC):
     def __init__(self, language: str, element_separator: str=None, subelement_separator: str=None, segment_separator: str=None, **kwargs):
         if language not in VALID_LANGUAGES:
             raise ValueError(f"{type(self).__name__} requires a language value of one of {VALID_LANGUAGES}. Received {language}.")
         self.language = language
-        if not element_separator:
-            self.element_separator = DEFAULT_SEPARATORS[self.language]["ELEMENT"]
-        if not subelement_separator:
-            self.subelement_separator = DEFAULT_SEPARATORS[self.language]["SUBELEMENT"]
-        if not segment_separator:
-            self.segment_separator = DEFAULT_SEPARATORS[self.language]["SEGMENT"]
-        self.element_separator = self.element_separator.encode().decode('unicode_escape')
-        self.subelement_separator = self.subelement_separator.encode().decode('unicode_escape')
-        self.segment_separator = self.segment_separator.encode().decode('unicode_escape')
+        self.extraction_errors = []
+        self._pending_failures = []
+        separators = _ESCAPED_SEPARATORS[self.language]
+        self.element_separator = _unescape_separator(element_separator) if element_separator else separators["ELEMENT"]
+        self.subelement_separator = _unescape_separator(subelement_separator) if subelement_separator else separators["SUBELEMENT"]
+        self.segment_separator = _unescape_separator(segment_separator) if segment_separator else separators["SEGMENT"]
         self.default_segments()
-        for key, value in kwargs.items():
-            setattr(self, key, value)
+        # Bound once so the per-segment handlers skip the method lookup.
+        self._extract = self.universal_element_extract
+        self.__dict__.update(kwargs)
         self.DISPATCH_MAP = {
             self.envelope_segment: self.handle_envelope,
             self.inner_message_segment: self.handle_inner,
@@ -141,37 +206,105 @@ class EdiBase(ABC):
             self.part_details_segment: self.handle_part,
             self.release_segment: self.handle_release,
             self.accum_segment: self.handle_accum,
-            self.file_end_segment: self.handle_end,
+            self.file_end_segment: self.end_document,
             self.loop_segment: self.handle_loop,
         }
+        # Flattened DISPATCH_MAP keyed by the individual segment tag so dispatching is a single dict lookup.
+        # Empty placeholder tags (e.g. EDIFACT ACCUM/RELEASE) are left out since no segment has an empty tag.
+        self.TAG_DISPATCH = {}
+        for segments, handler in self.DISPATCH_MAP.items():
+            for tag in _segment_tags(segments):
+                if tag:
+                    self.TAG_DISPATCH[tag] = handler
+
+    def dispatch_segment(self, segment: str, state: dict):
+        """
+        Call the handler registered for the segment's tag.
+
+        Returns the handler's result, or None if the segment has no handler.
+        """
+        handler = self.TAG_DISPATCH.get(segment.partition(self.element_separator)[0])
+        if handler is not None:
+            return handler(segment, state)
+
+    def end_document(self, segment, state):
+        """
+        Dispatched for the file end segment in place of handle_end.
+
+        Runs the subclass's handle_end, then reports the document's extraction failures with flush_warnings.
+        """
+        result = self.handle_end(segment, state)
+        self.flush_warnings()
+        return result
 
     def handle_extraction_error(self, error):
-        if not hasattr(self, 'extraction_errors'):
-            self.extraction_errors = []
         self.extraction_errors.append(error)
+        self._pending_failures.append(error)
         return error
+
+    def flush_warnings(self):
+        """
+        Emit a single warning summarizing extraction failures recorded since the last flush.
+
+        Failures are only collected while parsing so malformed documents don't pay for a warning per element.
+        end_document calls this for every document; call it directly when extracting outside the dispatch maps.
+        """
+        pending = self._pending_failures
+        self._pending_failures = []
+        if pending:
+            reasons = '; '.join(error.failure_reason for error in pending[:5])
+            if len(pending) > 5:
+                reasons += '; ...'
+            warn(f"{len(pending)} extraction failures: {reasons}")
     
     def default_segments(self):
-        self.envelope_segment = EDI_SEGMENTS[self.language]["ENVELOPE"]
-        self.inner_message_segment = EDI_SEGMENTS[self.language]["INNER_MESSAGE"]
-        self.record_start_segment = EDI_SEGMENTS[self.language]["RECORD_START"]
-        self.address_segment = EDI_SEGMENTS[self.language]["ADDRESS"]
-        self.loop_segment = EDI_SEGMENTS[self.language]["LOOP"]
-        self.claim_details_segment = EDI_SEGMENTS[self.language]["CLAIM_DETAILS"]
-        self.part_details_segment = EDI_SEGMENTS[self.language]["PART_DETAILS"]
-        self.date_details_segment = EDI_SEGMENTS[self.language]["DATE_DETAILS"]
-        self.release_type_segment = EDI_SEGMENTS[self.language]["RELEASE_TYPE"]
-        self.release_segment = EDI_SEGMENTS[self.language]["RELEASE"]
-        self.qty_details_segment = EDI_SEGMENTS[self.language]["QUANTITY"]
-        self.reference_segment = EDI_SEGMENTS[self.language]["REFERENCE"]
-        self.accum_segment = EDI_SEGMENTS[self.language]["ACCUM"]
-        self.service_line_details_segment = EDI_SEGMENTS[self.language]["SERVICE_LINE_DETAILS"]
-        self.problem_record_details_segment = EDI_SEGMENTS[self.language]["PROBLEM_RECORD_DETAILS"]
-        self.message_segment = EDI_SEGMENTS[self.language]["MESSAGE"]
-        self.total_charge_segment = EDI_SEGMENTS[self.language]["TOTAL_CHARGE"]
-        self.file_end_segment = EDI_SEGMENTS[self.language]["FILE_END"]
+        self.__dict__.update(_SEGMENT_ATTRS[self.language])
+
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _get_date_converter(date_format_in: str, date_format_out: str):
+        """
+        Returns a callable converting a date string from `date_format_in` to `date_format_out`.
 
+        The common X12 formats (\\%y\\%m\\%d and \\%Y\\%m\\%d to \\%m-\\%d-\\%Y) are handled by slicing the fixed-width string.
+        Anything the fast path can't handle is passed to strptime/strftime so failures raise the same errors.
+        """
+        def convert(element):
+            return datetime.strptime(element, date_format_in).strftime(date_format_out)
+
+        if date_format_out != '%m-%d-%Y' or date_format_in not in ('%y%m%d', '%Y%m%d'):
+            return convert
+        year_width = 2 if date_format_in == '%y%m%d' else 4
+        width = year_width + 4
+
+        def convert_fixed(element):
+            if len(element) != width or not (element.isascii() and element.isdigit()):
+                return convert(element)
+            year = int(element[:year_width])
+            if year_width == 2:
+                # Same pivot strptime uses for %y: 69-99 => 1900s, 00-68 => 2000s
+                year += 1900 if year >= 69 else 2000
+            elif year < 1000:
+                # strftime's %Y padding of short years depends on the C library, so leave those to it.
+                return convert(element)
+            month = element[year_width:year_width + 2]
+            day = element[year_width + 2:]
+            try:
+                datetime(year, int(month), int(day))
+            except ValueError:
+                return convert(element)
+            return f"{month}-{day}-{year}"
+        return convert_fixed
 
+    def _element_index_failure(self, segment: str, pos: int):
+        return self.handle_extraction_error(
+            ElementExtractionFailure(
+                failure_point='Element Index', 
+                failure_reason=f"Position {pos} out of range for {segment!r}", 
+                segment=segment, 
+                position=pos
+            )
+        )
 
     def universal_element_extract(self, segment: str, position: int | tuple[int, int] | list | dict, *, date: bool=False, date_format_in: str='%Y%m%d', date_format_out: str='%m-%d-%Y'):
         """
@@ -193,28 +326,45 @@ class EdiBase(ABC):
                 Extracted value(s), optionally formatted as dates.
         """
         
+        # A single plain element only needs the segment split up to that position.
+        if type(position) is int and position >= 0 and not date:
+            parts = segment.split(self.element_separator, position + 1)
+            if position < len(parts):
+                return parts[position]
+            return self._element_index_failure(segment, position)
+
+        handler = _POS_HANDLERS.get(type(position))
+        if handler is None:
+            # Subclasses (e.g. bool, namedtuple, OrderedDict) miss the exact type lookup.
+            handler = next((h for kind, h in _POS_HANDLERS.items() if isinstance(position, kind)), None)
+            if handler is None:
+                raise TypeError(
+                    f"Unsupported type for position: {type(position).__name__}. "
+                    "Expected int, tuple, list, or dict."
+                )
+
+        # Split once up front; every position indexes into the same elements.
+        parts = segment.split(self.element_separator)
+        subparts = {}
+        if date:
+            converter = self._get_date_converter(date_format_in, date_format_out)
+
         def extract_one(pos, *, force_date=None):
             if isinstance(pos, tuple):
                 pos, subpos = pos
             else:
                 subpos = None
-            try:
-                element = segment.split(self.element_separator)[pos]
-            except IndexError:
-                warn(f'Segment does not contain element at position {pos}: {segment}.')
-                return self.handle_extraction_error(
-                    ElementExtractionFailure(
-                        failure_point='Element Index', 
-                        failure_reason=f"Position {pos} out of range for {segment!r}", 
-                        segment=segment, 
-                        position=pos
-                    )
-                )
+            if -len(parts) <= pos < len(parts):
+                element = parts[pos]
+            else:
+                return self._element_index_failure(segment, pos)
             if subpos != None:
-                try:
-                    element = element.split(self.subelement_separator)[subpos]
-                except IndexError:
-                    warn(f'Element does not contain subelement at position {subpos}: {element}')
+                if pos not in subparts:
+                    subparts[pos] = element.split(self.subelement_separator)
+                subelements = subparts[pos]
+                if -len(subelements) <= subpos < len(subelements):
+                    element = subelements[subpos]
+                else:
                     return self.handle_extraction_error(
                         ElementExtractionFailure(
                             failure_point='Subelement Index', 
@@ -227,10 +377,9 @@ class EdiBase(ABC):
                     )
             if date:
                 try:
-                    element = datetime.strptime(element, date_format_in).strftime(date_format_out)
+                    element = converter(element)
                 except Exception as e:
                     if single_date or force_date:
-                        warn(f'Element does not match date format {element!r}: {date_format_in!r}.')
                         return self.handle_extraction_error(
                             ElementExtractionFailure(
                                 failure_point='Date conversion', 
@@ -246,34 +395,7 @@ class EdiBase(ABC):
             return element
         
         single_date = True if isinstance(position, int) else False
-        # --- Handle single ---
-        if isinstance(position, (int, tuple)):
-            return extract_one(position)
-
-        # --- Handle list of positions ---
-        elif isinstance(position, list):
-            return [extract_one(p) for p in position]
-
-        # --- Handle dict of named positions ---
-        elif isinstance(position, dict):
-            result = {}
-            for key, spec in position.items():
-                if isinstance(spec, dict):
-                    # supports e.g. {"pos": 4, "date": True}
-                    pos = spec.get("pos")
-                    force_date = spec.get("date", None)
-                else:
-                    pos = spec
-                    force_date = None
-                result[key] = extract_one(pos, force_date=force_date)
-            return result
-
-        # --- Unsupported input ---
-        else:
-            raise TypeError(
-                f"Unsupported type for position: {type(position).__name__}. "
-                "Expected int, tuple, list, or dict."
-            )
+        return handler(extract_one, position)
     @abstractmethod
     def handle_envelope(self, segment, state):...
     @abstractmethod
@@ -304,35 +426,57 @@ class EdiDocument(object):
         """
         self.ref_no = ref_no
         self.part_list = []
-        for key, value in kwargs.items():
-            setattr(self, key, value)
+        self.__dict__.update(kwargs)
     def add_attr(self, **kwargs):
-        for key, value in kwargs.items():
-            setattr(self, key, value)
+        self.__dict__.update(kwargs)
 
-class EdiPart(EdiDocument):
-    def __init__(self, part_no: str, revision=None, **kwargs):
-        self.part_no = part_no
-        self.revision = revision
+@dataclass(slots=True, eq=False, repr=False)
+class EdiPart(object):
+    """
+    Part level details within an EdiDocument.
+
+    Instantiated per part record, so attributes are fixed slots rather than a per-instance __dict__.
+    """
+    part_no: str
+    revision: str = None
+    _: KW_ONLY
+    po: str = None
+    customer_po: str = None
+    part_rev: str = field(init=False)
+    release_list: list = field(default_factory=list)
+    address: str = None
+    plant: str = None
+    total_accum: str = None
+    total_accum_start_date: str = None
+    total_accum_end_date: str = None
+    last_received_ship_quantity: str = None
+    last_received_ship_date: str = None
+    def __post_init__(self):
         self.part_rev = f"{self.part_no}-{self.revision}"
-        self.release_list = []
-        self.po = kwargs.get('po', None) or kwargs.get('customer_po', None)
-        self.address = None
-        self.total_accum = None
-        self.total_accum_start_date = None
-        self.total_accum_end_date = None
-        for key, value in kwargs.items():
-            setattr(self, key, value)
+        self.po = self.po or self.customer_po
     def __repr__(self):
         return f"EdiPart(part_no={self.part_no}, revision={self.revision}, po={self.po})"
+    def _check_field(self, name: str) -> None:
+        # There is no __dict__ to fall back on, so only declared fields can be set.
+        allowed = [f.name for f in fields(self)]
+        if name not in allowed:
+            raise AttributeError(f"{type(self).__name__} has no field {name!r}. Allowed fields: {allowed}")
+    def add_attr(self, **kwargs):
+        """Set declared fields by keyword. Raises AttributeError for names that aren't fields."""
+        for key, value in kwargs.items():
+            self._check_field(key)
+            setattr(self, key, value)
     def set_if_none(self, name: str, value) -> None:
-        if getattr(self, name, None) is None:
+        """Set a declared field only if it is currently None. Raises AttributeError for names that aren't fields."""
+        self._check_field(name)
+        if getattr(self, name) is None:
             setattr(self, name, value)
 
+@dataclass(slots=True, eq=False, repr=False)
 class EdiReleaseDetails(object):
-    def __init__(self, language: str, date: str, quantity: str, **kwargs):
+    language: InitVar[str]
+    date: str
+    quantity: str
+    __language__: str = field(init=False)
+    def __post_init__(self, language):
         self.__language__ = language
-        self.date = date
-        self.quantity = quantity
-        for key, value in kwargs.items():
-            setattr(self, key, value)
\ No newline at end of file
@@ -0,0 +1,228 @@
+import os
+import sys
+import unittest
+import warnings
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from edi import EdiBase, EdiPart, EdiReleaseDetails, ElementExtractionFailure
+from x12 import EdiX12, X12ReleaseDetails
+
+
+class X12(EdiX12):
+    """EdiX12 with the handlers it doesn't implement yet stubbed out."""
+    def handle_part(self, segment, state): pass
+    def handle_release(self, segment, state): pass
+    def handle_end(self, segment, state): pass
+
+
+def strptime_convert(element, date_format_in, date_format_out='%m-%d-%Y'):
+    try:
+        return datetime.strptime(element, date_format_in).strftime(date_format_out)
+    except ValueError as e:
+        return ValueError, str(e)
+
+
+def fast_convert(element, date_format_in, date_format_out='%m-%d-%Y'):
+    try:
+        return EdiBase._get_date_converter(date_format_in, date_format_out)(element)
+    except ValueError as e:
+        return ValueError, str(e)
+
+
+class DateConverterTests(unittest.TestCase):
+    SHORT_YEAR = [
+        '251031', '000101', '680101', '681231', '690101', '991231',
+        '000229', '010229', '250132', '251301', '250100', '250001',
+        '25103', '2510311', '', 'abcdef', '25-10-', '２５１０３１',
+    ]
+    LONG_YEAR = [
+        '20251031', '19000101', '20000229', '19000229', '20240229', '20230229',
+        '00010101', '00000101', '03490312', '09991231', '10000101', '99991231',
+        '20251340', '20251100', '20251131', '2025111', '202511011', '', 'abcdefgh',
+    ]
+
+    def test_short_year_matches_strptime(self):
+        for element in self.SHORT_YEAR:
+            with self.subTest(element=element):
+                self.assertEqual(fast_convert(element, '%y%m%d'), strptime_convert(element, '%y%m%d'))
+
+    def test_long_year_matches_strptime(self):
+        for element in self.LONG_YEAR:
+            with self.subTest(element=element):
+                self.assertEqual(fast_convert(element, '%Y%m%d'), strptime_convert(element, '%Y%m%d'))
+
+    def test_short_year_pivot(self):
+        self.assertEqual(fast_convert('681231', '%y%m%d'), '12-31-2068')
+        self.assertEqual(fast_convert('690101', '%y%m%d'), '01-01-1969')
+
+    def test_first_four_digit_year_uses_fast_path(self):
+        self.assertEqual(fast_convert('10000101', '%Y%m%d'), '01-01-1000')
+
+    def test_other_formats_use_strptime(self):
+        for date_format_in, date_format_out, element in [
+            ('%Y%m%d', '%Y-%m-%d', '20251031'),
+            ('%Y-%m-%d', '%m-%d-%Y', '2025-10-31'),
+            ('%y%m%d', '%d/%m/%y', '251031'),
+        ]:
+            with self.subTest(date_format_in=date_format_in, date_format_out=date_format_out):
+                self.assertEqual(
+                    fast_convert(element, date_format_in, date_format_out),
+                    strptime_convert(element, date_format_in, date_format_out),
+                )
+
+    def test_converter_is_cached(self):
+        self.assertIs(
+            EdiBase._get_date_converter('%Y%m%d', '%m-%d-%Y'),
+            EdiBase._get_date_converter('%Y%m%d', '%m-%d-%Y'),
+        )
+
+
+class ElementExtractTests(unittest.TestCase):
+    SEGMENTS = [
+        '', 'ISA', 'ISA*', '*', '**', 'REF*A', 'REF**B*', 'SHP*01*100**20250101',
+        'ISA*00*          *00*          *ZZ*SENDER         *ZZ*RECEIVER       *251031*1200*U*00401*000000123*0*P*<',
+    ]
+
+    def test_single_position_matches_split(self):
+        edi = X12()
+        for segment in self.SEGMENTS:
+            elements = segment.split('*')
+            for position in range(-len(elements), len(elements) + 3):
+                with self.subTest(segment=segment, position=position):
+                    result = edi.universal_element_extract(segment, position)
+                    if -len(elements) <= position < len(elements):
+                        self.assertEqual(result, elements[position])
+                    else:
+                        self.assertIsInstance(result, ElementExtractionFailure)
+                        self.assertEqual(result.failure_point, 'Element Index')
+                        self.assertEqual(result.position, position)
+
+    def test_list_matches_split(self):
+        edi = X12()
+        segment = 'SHP*01*100**20250101'
+        self.assertEqual(edi.universal_element_extract(segment, [0, 4, 1, 3, -1]), ['SHP', '20250101', '01', '', '20250101'])
+        missing = edi.universal_element_extract(segment, [2, 9])
+        self.assertEqual(missing[0], '100')
+        self.assertEqual(missing[1].failure_point, 'Element Index')
+
+    def test_subelements(self):
+        edi = X12()
+        segment = 'LIN*1*BP<A<B*VP'
+        self.assertEqual(edi.universal_element_extract(segment, [(2, 0), (2, 2), (3, 0)]), ['BP', 'B', 'VP'])
+        failure = edi.universal_element_extract(segment, (2, 3))
+        self.assertEqual(failure.failure_point, 'Subelement Index')
+
+    def test_failures_are_recorded(self):
+        edi = X12()
+        edi.universal_element_extract('REF*A', 5)
+        edi.universal_element_extract('REF*A', [1, 7])
+        self.assertEqual([failure.position for failure in edi.extraction_errors], [5, 7])
+
+
+class DispatchTests(unittest.TestCase):
+    def test_string_segments_are_single_tags(self):
+        edi = X12(file_end_segment='SE', record_start_segment='BSS')
+        self.assertEqual(edi.TAG_DISPATCH['SE'], edi.end_document)
+        self.assertEqual(edi.TAG_DISPATCH['BSS'], edi.handle_start)
+        self.assertNotIn('S', edi.TAG_DISPATCH)
+        self.assertNotIn('B', edi.TAG_DISPATCH)
+
+    def test_tuple_segments_expand_to_each_tag(self):
+        edi = X12()
+        self.assertEqual(edi.TAG_DISPATCH['SHP'], edi.handle_accum)
+        self.assertEqual(edi.TAG_DISPATCH['ATH'], edi.handle_accum)
+
+    def test_segment_defaults_are_not_shared(self):
+        edi = X12()
+        edi.file_end_segment = ('ZZ',)
+        self.assertEqual(X12().file_end_segment, ('SE',))
+
+    def test_loop_replaces_previous_start_tag(self):
+        edi = X12()
+        for segment in ('ST*830*0001', 'ST*862*0002', 'ST*850*0003'):
+            edi.handle_loop(segment, {})
+        start_tags = [tag for tag, handler in edi.TAG_DISPATCH.items() if handler == edi.handle_start]
+        self.assertEqual(start_tags, ['BEG'])
+
+
+class FailureWarningTests(unittest.TestCase):
+    def extract_failures(self, edi, count):
+        for _ in range(count):
+            edi.universal_element_extract('REF*A', 5)
+
+    def test_no_warning_per_failure(self):
+        edi = X12()
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            self.extract_failures(edi, 3)
+        self.assertEqual(caught, [])
+        self.assertEqual(len(edi.extraction_errors), 3)
+
+    def test_document_end_flushes_once(self):
+        edi = X12()
+        for end in (edi.DISPATCH_MAP[edi.file_end_segment], lambda s, st: edi.dispatch_segment(s, st)):
+            with self.subTest(end=end):
+                self.extract_failures(edi, 3)
+                with warnings.catch_warnings(record=True) as caught:
+                    warnings.simplefilter('always')
+                    end('SE*10*0001', {})
+                    end('SE*10*0001', {})
+                self.assertEqual(len(caught), 1)
+                self.assertIn('3 extraction failures', str(caught[0].message))
+
+    def test_flush_survives_reset(self):
+        edi = X12()
+        self.extract_failures(edi, 3)
+        edi.flush_warnings()
+        edi.extraction_errors = []
+        self.extract_failures(edi, 2)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            edi.flush_warnings()
+        self.assertEqual(len(caught), 1)
+        self.assertIn('2 extraction failures', str(caught[0].message))
+
+
+class EdiPartTests(unittest.TestCase):
+    def test_customer_po_alias(self):
+        part = EdiPart('P1', 'A', customer_po='PO9')
+        self.assertEqual(part.customer_po, 'PO9')
+        self.assertEqual(part.po, 'PO9')
+        self.assertEqual(part.part_rev, 'P1-A')
+
+    def test_po_takes_precedence(self):
+        part = EdiPart('P1', po='PO1', customer_po='PO9')
+        self.assertEqual(part.po, 'PO1')
+        self.assertIsNone(EdiPart('P1').customer_po)
+
+    def test_set_if_none(self):
+        part = EdiPart('P1', plant='PL1')
+        part.set_if_none('plant', 'PL2')
+        part.set_if_none('address', 'ADDR')
+        self.assertEqual((part.plant, part.address), ('PL1', 'ADDR'))
+
+    def test_unknown_fields_are_rejected(self):
+        part = EdiPart('P1')
+        for call in (lambda: part.set_if_none('customer_part', 'X'), lambda: part.add_attr(customer_part='X')):
+            with self.subTest(call=call):
+                with self.assertRaisesRegex(AttributeError, "no field 'customer_part'.*'part_no'"):
+                    call()
+
+
+class ReleaseDetailsTests(unittest.TestCase):
+    def test_language_keyword(self):
+        release = EdiReleaseDetails(language='X12', date='01-01-2025', quantity='10')
+        self.assertEqual(release.__language__, 'X12')
+        self.assertEqual((release.date, release.quantity), ('01-01-2025', '10'))
+        self.assertFalse(hasattr(release, 'language'))
+
+    def test_x12_release(self):
+        release = X12ReleaseDetails(date='01-01-2025', quantity='10', rel_type='C', rel_timing='W')
+        self.assertEqual(release.__language__, 'X12')
+        self.assertEqual((release.rel_type, release.rel_timing), ('Firm', 'Weekly Bucket'))
+
+
+if __name__ == '__main__':
+    unittest.main()
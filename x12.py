@@ -1,14 +1,16 @@
-from edi import EdiReleaseDetails, FORECAST_CROSSREF, TIMING_CROSSREF, EdiBase, EdiDocument
+from dataclasses import dataclass
+from types import MappingProxyType
+from edi import EdiReleaseDetails, FORECAST_CROSSREF, TIMING_CROSSREF, EdiBase, EdiDocument, _segment_tags
 
 # Date formats are inconsistent for each segment regardless of the format version
-DATE_FORMATS = {
+DATE_FORMATS = MappingProxyType({
     '0020': '%y%m%d',
     '0030': '%y%m%d',
     '0040': '%Y%m%d',
     '0050': '%Y%m%d',
     '0060': '%Y%m%d',
-}
-START_SEGMENTS = {
+})
+START_SEGMENTS = MappingProxyType({
                  # Record no # Doc Date
     '861':'BRA', # 1         #   2
     '810':'BIG', # 1         #   1
@@ -26,7 +28,16 @@ START_SEGMENTS = {
     '864':'BMG', # ? There isn't really any element which matches a "record ID" value for these text message files
     '820':'TRN', # 2 NOT the 4th line in the message. Uses 5th line instead.
     '832':'BCT', # ? There isn't really any element which matches a "record ID" value for these price catalog files
-}
+})
+# X12 cross references bound once so each release skips the language lookup.
+_X12_FORECAST = FORECAST_CROSSREF["X12"]
+_X12_TIMING = TIMING_CROSSREF["X12"]
+# Element index of the record number for each start segment. Anything not listed falls back to 0.
+_RECORD_NO_INDEX = MappingProxyType({
+    'BFR':3, 'BEG':3, 'BAK':3, 'BCH':3,
+    'BSN':2, 'BSS':2, 'BGN':2, 'AK1':2, 'TRN':2,
+    'BRA':1, 'BIG':1,
+})
 class EdiX12(EdiBase):
     def __init__(self, element_separator: str=None, subelement_separator: str=None, segment_separator: str=None, **kwargs):
         super().__init__('X12', element_separator, subelement_separator, segment_separator, **kwargs)
@@ -36,13 +47,9 @@ class EdiX12(EdiBase):
         # Looking at some unique situations, Stellantis 822 documents have 00204 in the ISA segment, but 004040 in the GS segment.
         # They are using Ymd formatted dates inside the message.
         # 
-        self.sender_id = self.universal_element_extract(segment, 6)
-        self.sender_qualifier = self.universal_element_extract(segment, 5)
-        self.receiver_id = self.universal_element_extract(segment, 8)
-        self.receiver_qualifier = self.universal_element_extract(segment, 7)
-        self.transaction_no = self.universal_element_extract(segment, 13)
-        # self.edi_version = self.universal_element_extract(segment, 10) # ISA - 00401 / 00200
-        # self.edi_version = self.universal_element_extract(segment, 8) # GS - 004010 / 002003
+        self.sender_qualifier, self.sender_id, self.receiver_qualifier, self.receiver_id, self.transaction_no = self._extract(segment, [5,6,7,8,13])
+        # self.edi_version = self._extract(segment, 10) # ISA - 00401 / 00200
+        # self.edi_version = self._extract(segment, 8) # GS - 004010 / 002003
         # self.date_format = DATE_FORMATS.get(self.edi_version, '%Y%m%d')
 
     def handle_inner(self, segment, state):
@@ -54,13 +61,18 @@ class EdiX12(EdiBase):
         There is a different between ISA and GS versions. Some customers have an ISA version of 00200, but the GS version can be 006010.
         The GS segment defines the date format inside the message.
         """
-        self.edi_version = self.universal_element_extract(segment, 8)[:4] # GS - 004010 / 002003 => 0040 / 0020
+        self.edi_version = self._extract(segment, 8)[:4] # GS - 004010 / 002003 => 0040 / 0020
         self.date_format = DATE_FORMATS.get(self.edi_version, '%Y%m%d')
-        state['document_issue_date'] = self.universal_element_extract(segment, 4, date=True, date_format_in=self.date_format)
+        state['document_issue_date'] = self._extract(segment, 4, date=True, date_format_in=self.date_format)
 
     def handle_loop(self, segment, state):
-        self.document_type = self.universal_element_extract(segment, 1)
+        self.document_type = self._extract(segment, 1)
+        # Swap the previous document type's start tag for this one's.
+        for tag in _segment_tags(self.record_start_segment):
+            if self.TAG_DISPATCH.get(tag) == self.handle_start:
+                del self.TAG_DISPATCH[tag]
         self.record_start_segment = START_SEGMENTS[self.document_type]
+        self.TAG_DISPATCH[self.record_start_segment] = self.handle_start
         
     def handle_start(self, segment, state):
         """
@@ -74,19 +86,8 @@ class EdiX12(EdiBase):
         * Document Issue Date - Element 8
 
         """
-        GROUP_3 = ('BFR', 'BEG', 'BAK', 'BCH')
-        GROUP_2 = ('BSN', 'BSS', 'BGN', 'AK1', 'TRN')
-        GROUP_1 = ('BRA', 'BIG')
-        if self.record_start_segment in GROUP_3:
-            record_no_index = 3
-        elif self.record_start_segment in GROUP_2:
-            record_no_index = 2
-        elif self.record_start_segment in GROUP_1:
-            record_no_index = 1
-        else:
-            record_no_index = 0
-
-        record_no = self.universal_element_extract(segment, record_no_index)
+        record_no_index = _RECORD_NO_INDEX.get(self.record_start_segment, 0)
+        record_no = self._extract(segment, record_no_index)
 
         # If an existing document is open, close it and store it
         if state["edi_class"]:
@@ -97,7 +98,7 @@ class EdiX12(EdiBase):
         edi_class = EdiDocument(record_no)
         edi_class.document_issue_date = state['document_issue_date']
         # These horizon dates may not exist.
-        edi_class.horizon_start_date, edi_class.horizon_end_date = self.universal_element_extract(segment, [6,7], date=True, date_format_in=self.date_format)
+        edi_class.horizon_start_date, edi_class.horizon_end_date = self._extract(segment, [6,7], date=True, date_format_in=self.date_format)
         state["edi_class"] = edi_class
 
     def handle_address(self, segment, state):
@@ -118,38 +119,40 @@ class EdiX12(EdiBase):
         * 16 - Ultimate Destination Code
         * II - Invoice Issuer (Assuming) - 810
         """
-        address_type = self.universal_element_extract(segment,1)
+        address_type = self._extract(segment,1)
         if address_type == 'ST':
-            state["address"] = self.universal_element_extract(segment,4)
+            state["address"] = self._extract(segment,4)
         if state["address"] and state["part_record"]:
             state["part_record"].plant = state["address"]
 
     def handle_accum(self, segment, state):
-        accum_type = self.universal_element_extract(segment,1)
+        extract = self._extract
+        accum_type = extract(segment,1)
         if state["part_record"]:
             if accum_type == '01':
-                q,d = self.universal_element_extract(segment,[2,4], date=True)
+                q,d = extract(segment,[2,4], date=True)
                 state["part_record"].last_received_ship_quantity = q
                 state["part_record"].last_received_ship_date = d
             elif accum_type == '02':
-                a, s, e = self.universal_element_extract(segment, [2,4,6], date=True)
+                a, s, e = extract(segment, [2,4,6], date=True)
                 state["part_record"].total_accum = a
                 state["part_record"].total_accum_start_date = s
                 state["part_record"].total_accum_end_date = e
             elif accum_type == 'PQ':
-                a, s, e = self.universal_element_extract(segment, [3,5,2], date=True)
+                a, s, e = extract(segment, [3,5,2], date=True)
                 state["part_record"].total_accum = a
                 state["part_record"].total_accum_start_date = s
                 state["part_record"].total_accum_end_date = e
 
+@dataclass(slots=True, eq=False, repr=False)
 class X12ReleaseDetails(EdiReleaseDetails):
-    def __init__(self, date: str, quantity: str, rel_type: str, rel_timing: str, **kwargs):
-        super().__init__('X12', date, quantity)
-
-        self.rel_type = FORECAST_CROSSREF[self.__language__].get(rel_type, None)
-        self.rel_timing = TIMING_CROSSREF[self.__language__].get(rel_timing, None)
-        for key, value in kwargs.items():
-            setattr(self, key, value)
+    rel_type: str = None
+    rel_timing: str = None
+    def __init__(self, date: str, quantity: str, rel_type: str, rel_timing: str):
+        # Zero-argument super() doesn't work in slotted dataclasses, so call the base explicitly.
+        EdiReleaseDetails.__init__(self, 'X12', date, quantity)
+        self.rel_type = _X12_FORECAST.get(rel_type, None)
+        self.rel_timing = _X12_TIMING.get(rel_timing, None)
 
     def __repr__(self):
         return f"X12ReleaseDetail(date={self.date}, quantity={self.quantity}, rel_type={self.rel_type}, rel_timing={self.rel_timing})"
\ No newline at end of file